@@ -140,6 +140,14 @@ class AutoTyperSessionUpdate(BaseModel):
     retry_count: Optional[int] = None
     can_resume: Optional[bool] = None
 
+class AutoTyperBatchCall(BaseModel):
+    call_id: str
+    op: str  # pause, resume, retry, stop, status
+    session_id: str
+
+class AutoTyperBatchRequest(BaseModel):
+    calls: List[AutoTyperBatchCall]
+
 # Discord Channel Models
 class DiscordChannel(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -483,7 +491,7 @@ async def stop_auto_typer_session(session_id: str):
         )
         
         logger.info(f"Stopped auto-typer session {session_id}")
-        return {"message": "Session stopped successfully"}
+        return {"message": "Session stopped successfully", "status": "stopped"}
     else:
         return {"error": "Session not found"}
 
@@ -512,7 +520,7 @@ async def pause_auto_typer_session(session_id: str):
             })
             
             logger.info(f"Paused auto-typer session {session_id}")
-            return {"message": "Session paused successfully"}
+            return {"message": "Session paused successfully", "status": "paused", "can_resume": True}
         else:
             return {"error": "Session is not running"}
     else:
@@ -541,7 +549,7 @@ async def resume_auto_typer_session(session_id: str):
             })
             
             logger.info(f"Resumed auto-typer session {session_id}")
-            return {"message": "Session resumed successfully"}
+            return {"message": "Session resumed successfully", "status": "running"}
         else:
             return {"error": "Session is not paused"}
     else:
@@ -565,7 +573,7 @@ async def resume_auto_typer_session(session_id: str):
             active_sessions[session_id]['task'] = task
             
             logger.info(f"Resumed auto-typer session {session_id} from database")
-            return {"message": "Session resumed successfully"}
+            return {"message": "Session resumed successfully", "status": "running"}
         else:
             return {"error": "Session not found or cannot be resumed"}
 
@@ -647,6 +655,28 @@ async def get_auto_typer_sessions():
     
     return [AutoTyperSession(**session) for session in sessions]
 
+@api_router.post("/auto-typer/batch")
+async def batch_auto_typer_calls(batch: AutoTyperBatchRequest):
+    """Run several session control/status calls in order in a single round trip"""
+    handlers = {
+        "pause": pause_auto_typer_session,
+        "resume": resume_auto_typer_session,
+        "retry": retry_failed_messages,
+        "stop": stop_auto_typer_session,
+        "status": get_auto_typer_session_status,
+    }
+    
+    results = []
+    for call in batch.calls:
+        handler = handlers.get(call.op)
+        if handler is None:
+            result = {"error": f"Unknown operation: {call.op}"}
+        else:
+            result = await handler(call.session_id)
+        results.append({"call_id": call.call_id, "op": call.op, "result": result})
+    
+    return {"results": results}
+
 # Discord Channel Management API Endpoints
 @api_router.post("/channels", response_model=DiscordChannel)
 async def create_discord_channel(channel_create: DiscordChannelCreate):
@@ -765,6 +795,14 @@ async def get_channel_categories():
         logger.error(f"Error fetching categories: {str(e)}")
         return {"categories": []}
 
+@api_router.get("/channels/{channel_id}", response_model=DiscordChannel)
+async def get_discord_channel(channel_id: str):
+    """Get a single saved Discord channel"""
+    channel = await db.discord_channels.find_one({"id": channel_id})
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    return DiscordChannel(**channel)
+
 # Helper function to fetch Discord channel info
 async def fetch_discord_channel_info(channel_id: str, bot_token: str):
     """Fetch channel information from Discord API"""
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Run the Playwright browser checks from test_browser.py and test_browser_install.py
+on one browser launch
+"""
+
+import os
+import asyncio
+from playwright.async_api import async_playwright
+
+# Use the same persistent browser cache as the backend so a warm runner skips the download
+os.environ.setdefault("PLAYWRIGHT_BROWSERS_PATH", "/pw-browsers")
+
+SMOKE_URL = "https://httpbin.org/get"
+
+# (name, wait_until) for each navigation check
+CHECKS = [
+    ("basic", "load"),
+    # httpbin's JSON page has no subresources, so networkidle would only add its 500ms quiet window
+    ("install", "domcontentloaded"),
+]
+
+async def smoke(*, wait_until="load", reporter=print, browser=None):
+    """Open SMOKE_URL in a fresh context and report its title.
+    Launches and closes its own browser unless one is passed in."""
+    if browser is None:
+        async with async_playwright() as p:
+            reporter("Launching browser...")
+            browser = await p.chromium.launch(headless=True)
+            reporter("Browser launched successfully!")
+            try:
+                return await smoke(wait_until=wait_until, reporter=reporter, browser=browser)
+            finally:
+                await browser.close()
+                reporter("Browser closed successfully!")
+
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        await page.goto(SMOKE_URL, wait_until=wait_until)
+        reporter(f"Page title: {await page.title()}")
+        return True
+    finally:
+        await context.close()
+
+async def run_checks():
+    """Launch chromium once and run every check against it concurrently"""
+    try:
+        async with async_playwright() as p:
+            print("Launching browser...")
+            browser = await p.chromium.launch(headless=True)
+            print("Browser launched successfully!")
+            try:
+                results = await asyncio.gather(
+                    *(smoke(wait_until=wait_until, reporter=lambda line, name=name: print(f"[{name}] {line}"), browser=browser)
+                      for name, wait_until in CHECKS),
+                    return_exceptions=True
+                )
+            finally:
+                await browser.close()
+                print("Browser closed successfully!")
+    except Exception as e:
+        print(f"Browser test failed: {str(e)}")
+        return False
+
+    for (name, _), result in zip(CHECKS, results):
+        if isinstance(result, Exception):
+            print(f"[{name}] Navigation failed: {str(result)}")
+    return all(result is True for result in results)
+
+if __name__ == "__main__":
+    result = asyncio.run(run_checks())
+    if result:
+        print("✅ Browser automation is working!")
+    else:
+        print("❌ Browser automation failed!")
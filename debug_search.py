@@ -3,58 +3,85 @@
 Debug search functionality
 """
 
-import requests
-import json
+import os
+import sys
+import httpx
+import orjson
+import asyncio
 
 BASE_URL = "https://web-autotyper-1.preview.emergentagent.com/api"
+# TEST_TRANSPORT=asgi drives the backend app in-process instead of the live deployment
+TEST_TRANSPORT = os.environ.get("TEST_TRANSPORT", "")
 HEADERS = {"Content-Type": "application/json"}
+TIMEOUT = httpx.Timeout(5, connect=3)
+# Set DEBUG_SEARCH=1 to print full response bodies instead of one-line summaries
+VERBOSE = bool(os.environ.get("DEBUG_SEARCH"))
 TEST_CHANNEL_ID = "123456789012345678"
 
-def debug_search():
+# Independent lookups issued together once the channel exists: (label, query params)
+SEARCHES = [
+    ("All channels", None),
+    ("Search", {"search": TEST_CHANNEL_ID}),
+    ("Partial search", {"search": "123456"}),
+    ("Category search", {"search": "Test"}),
+]
+
+def _in_process_app():
+    """Import the FastAPI app from backend/server.py to serve requests without a network"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+    from server import app
+    return app
+
+def make_client():
+    """One HTTP/2 client for every request in the script, retrying failed connects"""
+    if TEST_TRANSPORT == "asgi":
+        transport = httpx.ASGITransport(app=_in_process_app())
+    else:
+        transport = httpx.AsyncHTTPTransport(http2=True, retries=2)
+    return httpx.AsyncClient(base_url=BASE_URL, headers=HEADERS, timeout=TIMEOUT, transport=transport)
+
+def _rjson(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
+
+def _describe(data):
+    """Full pretty-printed body when verbose, otherwise a one-line summary"""
+    if VERBOSE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    if isinstance(data, list):
+        return f"{len(data)} items"
+    return f"keys={list(data)}"
+
+async def debug_search():
     print("🔍 Debugging Search Functionality")
-    
+
     # First create a channel
     payload = {
         "channel_id": TEST_CHANNEL_ID,
         "category": "Test Category",
         "is_favorite": False
     }
-    
-    create_response = requests.post(f"{BASE_URL}/channels", json=payload, headers=HEADERS)
-    print(f"Create response: {create_response.status_code}")
-    if create_response.status_code == 200:
-        create_data = create_response.json()
-        print(f"Created channel: {json.dumps(create_data, indent=2)}")
-        channel_uuid = create_data.get('id')
-        
-        # Get all channels first
-        all_response = requests.get(f"{BASE_URL}/channels")
-        print(f"All channels response: {all_response.status_code}")
-        all_data = all_response.json()
-        print(f"All channels: {json.dumps(all_data, indent=2)}")
-        
-        # Test search by channel ID
-        search_response = requests.get(f"{BASE_URL}/channels?search={TEST_CHANNEL_ID}")
-        print(f"Search response: {search_response.status_code}")
-        search_data = search_response.json()
-        print(f"Search results: {json.dumps(search_data, indent=2)}")
-        
-        # Test search by partial channel ID
-        partial_search = requests.get(f"{BASE_URL}/channels?search=123456")
-        print(f"Partial search response: {partial_search.status_code}")
-        partial_data = partial_search.json()
-        print(f"Partial search results: {json.dumps(partial_data, indent=2)}")
-        
-        # Test search by category
-        category_search = requests.get(f"{BASE_URL}/channels?search=Test")
-        print(f"Category search response: {category_search.status_code}")
-        category_data = category_search.json()
-        print(f"Category search results: {json.dumps(category_data, indent=2)}")
-        
-        # Clean up
-        if channel_uuid:
-            delete_response = requests.delete(f"{BASE_URL}/channels/{channel_uuid}")
-            print(f"Cleanup: {delete_response.status_code}")
-    
+
+    async with make_client() as client:
+        create_response = await client.post("/channels", json=payload)
+        print(f"Create response: {create_response.status_code}")
+        if create_response.status_code == 200:
+            create_data = _rjson(create_response)
+            print(f"Created channel: {_describe(create_data)}")
+            channel_uuid = create_data.get('id')
+
+            # The lookups don't depend on each other, so they share one round trip
+            responses = await asyncio.gather(
+                *(client.get("/channels", params=params) for _, params in SEARCHES)
+            )
+            for (label, _), response in zip(SEARCHES, responses):
+                print(f"{label} response: {response.status_code}")
+                print(f"{label} results: {_describe(_rjson(response))}")
+
+            # Clean up
+            if channel_uuid:
+                delete_response = await client.delete(f"/channels/{channel_uuid}")
+                print(f"Cleanup: {delete_response.status_code}")
+
 if __name__ == "__main__":
-    debug_search()
\ No newline at end of file
+    asyncio.run(debug_search())
@@ -3,180 +3,283 @@
 Final comprehensive test for Discord Channel Management API
 """
 
-import requests
-import json
-import time
+import os
+import sys
+import httpx
+import orjson
+import socket
+import asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 BASE_URL = "https://web-autotyper-1.preview.emergentagent.com/api"
-HEADERS = {"Content-Type": "application/json"}
+# TEST_TRANSPORT=asgi drives the backend app in-process instead of the live deployment
+TEST_TRANSPORT = os.environ.get("TEST_TRANSPORT", "")
+# Small JSON round trips: disable Nagle and keep idle pooled connections alive
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+HEADERS = {"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate, br"}
+CHANNELS_PATH = "/channels"
+CATEGORIES_PATH = "/channels/categories"
 TEST_CHANNEL_ID = "123456789012345678"
+TEST_CATEGORY = "Test Category"
+CREATE_PAYLOAD_BYTES = orjson.dumps({
+    "channel_id": TEST_CHANNEL_ID,
+    "category": TEST_CATEGORY,
+    "is_favorite": False
+})
+REQUIRED_CHANNEL_FIELDS = frozenset(("id", "channel_id", "category", "is_favorite", "created_at"))
+UPDATE_PAYLOAD = {
+    "channel_name": "Updated Test Channel",
+    "category": "Updated Category",
+    "is_favorite": True
+}
+
+def _in_process_app():
+    """Import the FastAPI app from backend/server.py to serve requests without a network"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+    from server import app
+    return app
+
+def make_client():
+    """One pooled HTTP/2 client for the whole workflow, retrying failed connects"""
+    if TEST_TRANSPORT == "asgi":
+        return httpx.AsyncClient(base_url=BASE_URL, headers=HEADERS, transport=httpx.ASGITransport(app=_in_process_app()))
+    # http2 and limits belong on the transport once one is passed explicitly
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        socket_options=SOCKET_OPTIONS,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+    return httpx.AsyncClient(base_url=BASE_URL, headers=HEADERS, timeout=httpx.Timeout(5, connect=3), transport=transport)
+
+def _rjson(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
+
+def _index(data, key="channel_id"):
+    """Map each record in a channel list by key for O(1) membership checks"""
+    return {ch[key]: ch for ch in data if key in ch}
+
+async def check_health(client, state, out):
+    out.append("1️⃣ Testing API Health...")
+    response = await client.get("/")
+    if response.status_code == 200:
+        out.append("✅ API is healthy")
+        return "✅ API Health Check"
+    out.append(f"❌ API health check failed: {response.status_code}")
+    return "❌ API Health Check"
+
+async def create_channel(client, state, out):
+    out.append("\n2️⃣ Creating Discord Channel...")
+    response = await client.post(CHANNELS_PATH, content=CREATE_PAYLOAD_BYTES)
+    if response.status_code == 200:
+        data = _rjson(response)
+        missing = REQUIRED_CHANNEL_FIELDS - data.keys()
+        if "error" not in data and not missing:
+            state["channel_uuid"] = data.get('id')
+            state["created_channels"].add(state["channel_uuid"])
+            out.append(f"✅ Channel created with ID: {state['channel_uuid']}")
+            return "✅ Create Channel"
+        out.append(f"❌ Channel creation failed: {data.get('error') or f'missing fields {sorted(missing)}'}")
+        return "❌ Create Channel"
+    out.append(f"❌ Channel creation failed: HTTP {response.status_code}")
+    return "❌ Create Channel"
+
+async def get_all_channels(client, state, out):
+    out.append("\n3️⃣ Retrieving All Channels...")
+    response = await client.get(CHANNELS_PATH)
+    if response.status_code == 200:
+        channels = _rjson(response)
+        if len(channels) > 0:
+            out.append(f"✅ Retrieved {len(channels)} channels")
+            return "✅ Get All Channels"
+        out.append("❌ No channels found")
+        return "❌ Get All Channels"
+    out.append(f"❌ Failed to get channels: HTTP {response.status_code}")
+    return "❌ Get All Channels"
+
+async def search_channels(client, state, out):
+    out.append("\n4️⃣ Testing Search...")
+    response = await client.get(CHANNELS_PATH, params={"search": TEST_CHANNEL_ID})
+    if response.status_code == 200:
+        search_results = _rjson(response)
+        if TEST_CHANNEL_ID in _index(search_results):
+            out.append("✅ Search functionality working")
+            return "✅ Search Functionality"
+        out.append("❌ Search did not find expected channel")
+        return "❌ Search Functionality"
+    out.append(f"❌ Search failed: HTTP {response.status_code}")
+    return "❌ Search Functionality"
+
+async def filter_by_category(client, state, out):
+    out.append("\n5️⃣ Testing Category Filter...")
+    response = await client.get(CHANNELS_PATH, params={"category": TEST_CATEGORY})
+    if response.status_code == 200:
+        filtered_results = _rjson(response)
+        categories = {ch.get("category") for ch in filtered_results}
+        if categories == {TEST_CATEGORY}:
+            out.append(f"✅ Category filter returned {len(filtered_results)} channels")
+            return "✅ Category Filter"
+        if not filtered_results:
+            out.append("❌ Category filter returned no results")
+        else:
+            out.append(f"❌ Category filter returned other categories: {sorted(map(str, categories - {TEST_CATEGORY}))}")
+        return "❌ Category Filter"
+    out.append(f"❌ Category filter failed: HTTP {response.status_code}")
+    return "❌ Category Filter"
+
+async def update_channel(client, state, out):
+    channel_uuid = state["channel_uuid"]
+    if not channel_uuid:
+        return None
+    out.append("\n6️⃣ Testing Channel Update...")
+    response = await client.put(CHANNELS_PATH + "/" + channel_uuid, content=orjson.dumps(UPDATE_PAYLOAD))
+    if response.status_code == 200:
+        data = _rjson(response)
+        if UPDATE_PAYLOAD.items() <= data.items():
+            out.append("✅ Channel updated successfully")
+            return "✅ Update Channel"
+        out.append(f"❌ Channel update failed: {data}")
+        return "❌ Update Channel"
+    out.append(f"❌ Channel update failed: HTTP {response.status_code}")
+    return "❌ Update Channel"
+
+async def get_categories(client, state, out):
+    out.append("\n7️⃣ Testing Get Categories...")
+    response = await client.get(CATEGORIES_PATH)
+    if response.status_code == 200:
+        data = _rjson(response)
+        if "categories" in data and len(data["categories"]) > 0:
+            out.append(f"✅ Retrieved categories: {data['categories']}")
+            return "✅ Get Categories"
+        out.append("❌ No categories found")
+        return "❌ Get Categories"
+    out.append(f"❌ Get categories failed: HTTP {response.status_code}")
+    return "❌ Get Categories"
+
+async def check_error_handling(client, state, out):
+    out.append("\n8️⃣ Testing Error Handling...")
+    response = await client.put(CHANNELS_PATH + "/nonexistent-id", content=orjson.dumps({"channel_name": "test"}))
+    if response.status_code == 200:
+        data = _rjson(response)
+        if "error" in data:
+            out.append("✅ Error handling working correctly")
+            return "✅ Error Handling"
+        out.append("❌ Should have returned error for non-existent channel")
+        return "❌ Error Handling"
+    out.append("✅ Error handling working (HTTP error returned)")
+    return "✅ Error Handling"
+
+async def channel_exists(client, channel_uuid):
+    """Look a channel up by id, scanning the full list only if the API has no such route"""
+    response = await client.get(CHANNELS_PATH + "/" + channel_uuid, timeout=5)
+    if response.status_code == 405:
+        # Search doesn't cover the uuid; a raw byte scan avoids decoding the whole list
+        response = await client.get(CHANNELS_PATH)
+        return b'"' + channel_uuid.encode() + b'"' in response.content
+    return response.status_code == 200
+
+async def delete_channel(client, state, out):
+    channel_uuid = state["channel_uuid"]
+    if not channel_uuid:
+        return None
+    out.append("\n9️⃣ Testing Channel Deletion...")
+    response = await client.delete(CHANNELS_PATH + "/" + channel_uuid)
+    if response.status_code == 200:
+        # The success body is a fixed message; only decode it when it may carry an error
+        if b'"error"' in response.content[:200]:
+            data = _rjson(response)
+            if "error" in data:
+                out.append(f"❌ Channel deletion failed: {data['error']}")
+                return "❌ Delete Channel"
+        state["created_channels"].discard(channel_uuid)
+        if await channel_exists(client, channel_uuid):
+            out.append("❌ Channel still exists after deletion")
+            return "❌ Delete Channel"
+        out.append("✅ Channel deleted successfully")
+        return "✅ Delete Channel"
+    out.append(f"❌ Channel deletion failed: HTTP {response.status_code}")
+    return "❌ Delete Channel"
+
+# Steps within a phase are independent and run concurrently; phases run in order
+WORKFLOW_PHASES = [
+    [check_health],
+    [create_channel],
+    [get_all_channels, search_channels, filter_by_category, get_categories, check_error_handling],
+    [update_channel],
+    [delete_channel],
+]
+
+async def cleanup(client, channel_ids):
+    """Delete any channels the workflow left behind, all at once"""
+    await asyncio.gather(*(client.delete(CHANNELS_PATH + "/" + cid) for cid in channel_ids), return_exceptions=True)
+
+async def _run_phases(client, state, results):
+    """Run each phase concurrently, appending step results in declaration order"""
+    for index, phase in enumerate(WORKFLOW_PHASES):
+        outputs = [[] for _ in phase]
+        phase_results = await asyncio.gather(
+            *(step(client, state, out) for step, out in zip(phase, outputs)),
+            return_exceptions=True
+        )
+        # Print in declaration order regardless of completion order
+        for out, result in zip(outputs, phase_results):
+            for line in out:
+                print(line)
+            if isinstance(result, Exception):
+                print(f"❌ Test execution failed: {str(result)}")
+                results.append(f"❌ Test execution failed: {str(result)}")
+            elif result:
+                results.append(result)
+
+        # Every later step would just wait out its timeout against an unreachable API
+        if check_health in phase and "✅ API Health Check" not in results:
+            skipped = sum(len(later) for later in WORKFLOW_PHASES[index + 1:])
+            print(f"\n⏭️ Skipping {skipped} remaining steps: API unreachable")
+            return
+
+async def run_workflow():
+    results = []
+    state = {"channel_uuid": None, "created_channels": set()}
+
+    async with make_client() as client:
+        try:
+            await _run_phases(client, state, results)
+        finally:
+            await cleanup(client, list(state["created_channels"]))
+
+    return results
 
 def test_complete_workflow():
     print("🚀 Testing Complete Discord Channel Management Workflow")
     print("=" * 60)
-    
-    results = []
-    channel_uuid = None
-    
+
+    # uvloop-backed when available
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
     try:
-        # 1. Health Check
-        print("1️⃣ Testing API Health...")
-        response = requests.get(f"{BASE_URL}/", timeout=15)
-        if response.status_code == 200:
-            print("✅ API is healthy")
-            results.append("✅ API Health Check")
-        else:
-            print(f"❌ API health check failed: {response.status_code}")
-            results.append("❌ API Health Check")
-        
-        # 2. Create Channel
-        print("\n2️⃣ Creating Discord Channel...")
-        payload = {
-            "channel_id": TEST_CHANNEL_ID,
-            "category": "Test Category",
-            "is_favorite": False
-        }
-        response = requests.post(f"{BASE_URL}/channels", json=payload, headers=HEADERS, timeout=15)
-        if response.status_code == 200:
-            data = response.json()
-            if "error" not in data:
-                channel_uuid = data.get('id')
-                print(f"✅ Channel created with ID: {channel_uuid}")
-                results.append("✅ Create Channel")
-            else:
-                print(f"❌ Channel creation failed: {data['error']}")
-                results.append("❌ Create Channel")
-        else:
-            print(f"❌ Channel creation failed: HTTP {response.status_code}")
-            results.append("❌ Create Channel")
-        
-        # 3. Get All Channels
-        print("\n3️⃣ Retrieving All Channels...")
-        response = requests.get(f"{BASE_URL}/channels", timeout=15)
-        if response.status_code == 200:
-            channels = response.json()
-            if len(channels) > 0:
-                print(f"✅ Retrieved {len(channels)} channels")
-                results.append("✅ Get All Channels")
-            else:
-                print("❌ No channels found")
-                results.append("❌ Get All Channels")
-        else:
-            print(f"❌ Failed to get channels: HTTP {response.status_code}")
-            results.append("❌ Get All Channels")
-        
-        # 4. Search Functionality
-        print("\n4️⃣ Testing Search...")
-        response = requests.get(f"{BASE_URL}/channels?search={TEST_CHANNEL_ID}", timeout=15)
-        if response.status_code == 200:
-            search_results = response.json()
-            found = any(ch.get("channel_id") == TEST_CHANNEL_ID for ch in search_results)
-            if found:
-                print("✅ Search functionality working")
-                results.append("✅ Search Functionality")
-            else:
-                print("❌ Search did not find expected channel")
-                results.append("❌ Search Functionality")
-        else:
-            print(f"❌ Search failed: HTTP {response.status_code}")
-            results.append("❌ Search Functionality")
-        
-        # 5. Category Filter
-        print("\n5️⃣ Testing Category Filter...")
-        response = requests.get(f"{BASE_URL}/channels?category=Test Category", timeout=15)
-        if response.status_code == 200:
-            filtered_results = response.json()
-            if len(filtered_results) > 0:
-                print(f"✅ Category filter returned {len(filtered_results)} channels")
-                results.append("✅ Category Filter")
-            else:
-                print("❌ Category filter returned no results")
-                results.append("❌ Category Filter")
-        else:
-            print(f"❌ Category filter failed: HTTP {response.status_code}")
-            results.append("❌ Category Filter")
-        
-        # 6. Update Channel
-        if channel_uuid:
-            print("\n6️⃣ Testing Channel Update...")
-            update_payload = {
-                "channel_name": "Updated Test Channel",
-                "category": "Updated Category",
-                "is_favorite": True
-            }
-            response = requests.put(f"{BASE_URL}/channels/{channel_uuid}", json=update_payload, headers=HEADERS, timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                if "error" not in data and data.get("is_favorite") == True:
-                    print("✅ Channel updated successfully")
-                    results.append("✅ Update Channel")
-                else:
-                    print(f"❌ Channel update failed: {data}")
-                    results.append("❌ Update Channel")
-            else:
-                print(f"❌ Channel update failed: HTTP {response.status_code}")
-                results.append("❌ Update Channel")
-        
-        # 7. Get Categories
-        print("\n7️⃣ Testing Get Categories...")
-        response = requests.get(f"{BASE_URL}/channels/categories", timeout=15)
-        if response.status_code == 200:
-            data = response.json()
-            if "categories" in data and len(data["categories"]) > 0:
-                print(f"✅ Retrieved categories: {data['categories']}")
-                results.append("✅ Get Categories")
-            else:
-                print("❌ No categories found")
-                results.append("❌ Get Categories")
-        else:
-            print(f"❌ Get categories failed: HTTP {response.status_code}")
-            results.append("❌ Get Categories")
-        
-        # 8. Error Handling Test
-        print("\n8️⃣ Testing Error Handling...")
-        response = requests.put(f"{BASE_URL}/channels/nonexistent-id", json={"channel_name": "test"}, headers=HEADERS, timeout=15)
-        if response.status_code == 200:
-            data = response.json()
-            if "error" in data:
-                print("✅ Error handling working correctly")
-                results.append("✅ Error Handling")
-            else:
-                print("❌ Should have returned error for non-existent channel")
-                results.append("❌ Error Handling")
-        else:
-            print("✅ Error handling working (HTTP error returned)")
-            results.append("✅ Error Handling")
-        
-        # 9. Delete Channel
-        if channel_uuid:
-            print("\n9️⃣ Testing Channel Deletion...")
-            response = requests.delete(f"{BASE_URL}/channels/{channel_uuid}", timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                if "error" not in data:
-                    print("✅ Channel deleted successfully")
-                    results.append("✅ Delete Channel")
-                else:
-                    print(f"❌ Channel deletion failed: {data['error']}")
-                    results.append("❌ Delete Channel")
-            else:
-                print(f"❌ Channel deletion failed: HTTP {response.status_code}")
-                results.append("❌ Delete Channel")
-    
+        results = loop.run_until_complete(run_workflow())
     except Exception as e:
         print(f"❌ Test execution failed: {str(e)}")
-        results.append(f"❌ Test execution failed: {str(e)}")
-    
+        results = [f"❌ Test execution failed: {str(e)}"]
+    finally:
+        loop.close()
+
     # Summary
     print("\n" + "=" * 60)
     print("📊 FINAL TEST RESULTS:")
     for result in results:
         print(f"  {result}")
-    
+
     passed = len([r for r in results if r.startswith("✅")])
     total = len(results)
     print(f"\n🎯 SUMMARY: {passed}/{total} tests passed ({passed/total*100:.1f}%)")
-    
+
     if passed >= 7:  # Allow for some minor issues
         print("🎉 Discord Channel Management API is working correctly!")
         return True
@@ -186,4 +289,4 @@ def test_complete_workflow():
 
 if __name__ == "__main__":
     success = test_complete_workflow()
-    exit(0 if success else 1)
\ No newline at end of file
+    exit(0 if success else 1)
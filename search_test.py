@@ -3,13 +3,43 @@
 Focused test for search functionality
 """
 
+import os
+import sys
 import requests
-import json
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "https://web-autotyper-1.preview.emergentagent.com/api"
+# TEST_TRANSPORT=asgi drives the backend app in-process instead of the live deployment
+TEST_TRANSPORT = os.environ.get("TEST_TRANSPORT", "")
 HEADERS = {"Content-Type": "application/json"}
+TIMEOUT = (3, 5)  # connect, read seconds
 TEST_CHANNEL_ID = "123456789012345678"
 
+def _in_process_app():
+    """Import the FastAPI app from backend/server.py to serve requests without a network"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+    from server import app
+    return app
+
+# One pooled keep-alive session for every request in the script
+if TEST_TRANSPORT == "asgi":
+    from fastapi.testclient import TestClient
+    SESSION = TestClient(_in_process_app())
+else:
+    SESSION = requests.Session()
+    SESSION.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, connect=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False),
+    ))
+SESSION.headers.update(HEADERS)
+
+def _rjson(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
+
 def test_search_functionality():
     print("🔍 Testing Search Functionality")
     
@@ -20,26 +50,26 @@ def test_search_functionality():
         "is_favorite": False
     }
     
-    create_response = requests.post(f"{BASE_URL}/channels", json=payload, headers=HEADERS)
+    create_response = SESSION.post(f"{BASE_URL}/channels", json=payload, timeout=TIMEOUT)
     print(f"Create response: {create_response.status_code}")
     if create_response.status_code == 200:
-        create_data = create_response.json()
+        create_data = _rjson(create_response)
         print(f"Created channel: {create_data}")
         channel_uuid = create_data.get('id')
         
         # Test search by channel ID
-        search_response = requests.get(f"{BASE_URL}/channels?search={TEST_CHANNEL_ID}")
+        search_response = SESSION.get(f"{BASE_URL}/channels?search={TEST_CHANNEL_ID}", timeout=TIMEOUT)
         print(f"Search response: {search_response.status_code}")
-        search_data = search_response.json()
+        search_data = _rjson(search_response)
         print(f"Search results: {search_data}")
         
         # Check if channel is found
-        found = any(ch.get("channel_id") == TEST_CHANNEL_ID for ch in search_data)
+        found = TEST_CHANNEL_ID in {ch.get("channel_id") for ch in search_data}
         print(f"Channel found in search: {found}")
         
         # Clean up
         if channel_uuid:
-            delete_response = requests.delete(f"{BASE_URL}/channels/{channel_uuid}")
+            delete_response = SESSION.delete(f"{BASE_URL}/channels/{channel_uuid}", timeout=TIMEOUT)
             print(f"Cleanup: {delete_response.status_code}")
     
 if __name__ == "__main__":
@@ -4,17 +4,25 @@ Focused Session Management Test for Discord Autotyper
 Tests the specific issue reported by user: control panel buttons becoming unresponsive
 """
 
-import requests
-import json
+import httpx
+import orjson
 import time
 import asyncio
 import websockets
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 from datetime import datetime
+from backend_test import BATCH_EXPECTED_ERRORS, _expected_error
 
 # Configuration
 BASE_URL = "https://web-autotyper-1.preview.emergentagent.com/api"
 WS_URL = "wss://web-autotyper.preview.emergentagent.com/api/ws"
 HEADERS = {"Content-Type": "application/json"}
+# Control sequence sent through the batch endpoint in one round trip
+BATCH_OPS = ("pause", "status", "resume", "status")
+PING_PAYLOAD = orjson.dumps({"action": "ping"}).decode()
 
 # Test data as specified in the review request
 TEST_CHANNEL_ID = "123456789012345678"
@@ -22,11 +30,41 @@ TEST_MESSAGES = ["Test message 1", "Test message 2"]
 TEST_TYPING_DELAY = 1000
 TEST_MESSAGE_DELAY = 5000
 
+def _with_timestamp(result):
+    """Result row with its time.time_ns() stamp formatted as ISO, done once when results are written"""
+    row = {k: v for k, v in result.items() if k != "ts_ns"}
+    row["timestamp"] = datetime.fromtimestamp(result["ts_ns"] / 1e9).isoformat()
+    return row
+
 class SessionManagementTester:
+    # Tests within a phase are independent and run concurrently
+    TEST_PHASES = (
+        (("Session Creation", "test_session_creation"),),
+        (("Session Status Transitions", "test_session_status_transitions"),),
+        # Control calls change session state, so they stay strictly ordered
+        (("Pause Control", "test_pause_control"),),
+        (("Resume Control", "test_resume_control"),),
+        (("Batched Controls", "test_batched_controls"),),
+        (("Stop Control", "test_stop_control"),),
+        # Last, as before: the connection check runs against the stopped session
+        (("WebSocket Connection", "test_websocket_connection"),),
+    )
+    
     def __init__(self):
         self.session_id = None
         self.test_results = []
         
+        # One event loop for every async test, uvloop-backed when available, closed once the run is over
+        self._loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        
+        # One HTTP/2 client for every request; concurrent calls multiplex on one connection
+        self.client = httpx.AsyncClient(
+            http2=True,
+            headers=HEADERS,
+            timeout=15,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+        )
+        
     def log_result(self, test_name, success, message, details=None):
         """Log test result"""
         status = "✅ PASS" if success else "❌ FAIL"
@@ -39,10 +77,10 @@ class SessionManagementTester:
             "success": success,
             "message": message,
             "details": details,
-            "timestamp": datetime.now().isoformat()
+            "ts_ns": time.time_ns()
         })
     
-    def test_session_creation(self):
+    async def test_session_creation(self):
         """Test POST /api/auto-typer/start with specified test data"""
         try:
             payload = {
@@ -52,7 +90,7 @@ class SessionManagementTester:
                 "message_delay": TEST_MESSAGE_DELAY
             }
             
-            response = requests.post(f"{BASE_URL}/auto-typer/start", json=payload, headers=HEADERS, timeout=15)
+            response = await self.client.post(f"{BASE_URL}/auto-typer/start", json=payload, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -81,14 +119,14 @@ class SessionManagementTester:
             self.log_result("Session Creation", False, f"Request failed: {str(e)}")
             return False
     
-    def test_session_status_transitions(self):
+    async def test_session_status_transitions(self):
         """Test session status endpoint and verify state transitions"""
         if not self.session_id:
             self.log_result("Session Status", False, "No session ID available")
             return False
         
         try:
-            response = requests.get(f"{BASE_URL}/auto-typer/{self.session_id}/status", timeout=10)
+            response = await self.client.get(f"{BASE_URL}/auto-typer/{self.session_id}/status", timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -119,14 +157,14 @@ class SessionManagementTester:
             self.log_result("Session Status", False, f"Request failed: {str(e)}")
             return False
     
-    def test_pause_control(self):
+    async def test_pause_control(self):
         """Test POST /api/auto-typer/{session_id}/pause"""
         if not self.session_id:
             self.log_result("Pause Control", False, "No session ID available")
             return False
         
         try:
-            response = requests.post(f"{BASE_URL}/auto-typer/{self.session_id}/pause", headers=HEADERS, timeout=10)
+            response = await self.client.post(f"{BASE_URL}/auto-typer/{self.session_id}/pause", timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -155,14 +193,14 @@ class SessionManagementTester:
             self.log_result("Pause Control", False, f"Request failed: {str(e)}")
             return False
     
-    def test_resume_control(self):
+    async def test_resume_control(self):
         """Test POST /api/auto-typer/{session_id}/resume"""
         if not self.session_id:
             self.log_result("Resume Control", False, "No session ID available")
             return False
         
         try:
-            response = requests.post(f"{BASE_URL}/auto-typer/{self.session_id}/resume", headers=HEADERS, timeout=10)
+            response = await self.client.post(f"{BASE_URL}/auto-typer/{self.session_id}/resume", timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -191,14 +229,58 @@ class SessionManagementTester:
             self.log_result("Resume Control", False, f"Request failed: {str(e)}")
             return False
     
-    def test_stop_control(self):
+    async def _batch(self, session_id, ops):
+        """Run control/status ops in order, in one request when the batch endpoint is deployed"""
+        calls = [{"call_id": str(i), "op": op, "session_id": session_id} for i, op in enumerate(ops)]
+        response = await self.client.post(f"{BASE_URL}/auto-typer/batch", content=orjson.dumps({"calls": calls}), timeout=10)
+        if response.status_code not in (404, 405):
+            response.raise_for_status()
+            return [r["result"] for r in orjson.loads(response.content)["results"]]
+        
+        # Older deployments: the same calls one by one over the keep-alive connection, still in order
+        results = []
+        for op in ops:
+            url = f"{BASE_URL}/auto-typer/{session_id}/{op}"
+            response = await (self.client.get(url, timeout=10) if op == "status" else self.client.post(url, timeout=10))
+            results.append(response.json())
+        return results
+    
+    async def test_batched_controls(self):
+        """Test pause/resume with status checks sent as one POST /api/auto-typer/batch"""
+        if not self.session_id:
+            self.log_result("Batched Controls", False, "No session ID available")
+            return False
+        
+        try:
+            results = await self._batch(self.session_id, BATCH_OPS)
+            if len(results) != len(BATCH_OPS):
+                self.log_result("Batched Controls", False, f"Expected {len(BATCH_OPS)} results, got {len(results)}")
+                return False
+            
+            unexpected = [
+                (op, result["error"]) for op, result in zip(BATCH_OPS, results)
+                if "error" in result and not _expected_error(result["error"], BATCH_EXPECTED_ERRORS)
+            ]
+            if unexpected:
+                self.log_result("Batched Controls", False, f"Unexpected errors: {unexpected}")
+                return False
+            
+            statuses = [result.get("status") for op, result in zip(BATCH_OPS, results) if op == "status"]
+            self.log_result("Batched Controls", True, f"{len(results)} calls answered in order", f"Statuses: {statuses}")
+            return True
+            
+        except Exception as e:
+            self.log_result("Batched Controls", False, f"Request failed: {str(e)}")
+            return False
+    
+    async def test_stop_control(self):
         """Test POST /api/auto-typer/{session_id}/stop"""
         if not self.session_id:
             self.log_result("Stop Control", False, "No session ID available")
             return False
         
         try:
-            response = requests.post(f"{BASE_URL}/auto-typer/{self.session_id}/stop", headers=HEADERS, timeout=10)
+            response = await self.client.post(f"{BASE_URL}/auto-typer/{self.session_id}/stop", timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -238,16 +320,16 @@ class SessionManagementTester:
                 # Wait for connection confirmation
                 try:
                     message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                    data = json.loads(message)
+                    data = orjson.loads(message)
                     
                     if data.get("type") == "connection_established":
                         self.log_result("WebSocket Connection", True, f"WebSocket connected successfully", 
                                       f"Message: {data.get('message')}")
                         
                         # Test ping-pong
-                        await websocket.send(json.dumps({"action": "ping"}))
+                        await websocket.send(PING_PAYLOAD)
                         pong_response = await asyncio.wait_for(websocket.recv(), timeout=3.0)
-                        pong_data = json.loads(pong_response)
+                        pong_data = orjson.loads(pong_response)
                         
                         if pong_data.get("type") == "pong":
                             self.log_result("WebSocket Ping-Pong", True, "Ping-pong working correctly")
@@ -267,26 +349,45 @@ class SessionManagementTester:
             self.log_result("WebSocket Connection", False, f"WebSocket connection failed: {str(e)}")
             return False
     
-    def run_websocket_test(self, test_func):
-        """Helper to run async WebSocket tests"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop.run_until_complete(test_func())
-        except Exception as e:
-            print(f"Error running WebSocket test: {str(e)}")
-            return False
-        finally:
-            loop.close()
-    
-    def cleanup_session(self):
+    async def cleanup_session(self):
         """Clean up test session"""
         if self.session_id:
             try:
-                requests.post(f"{BASE_URL}/auto-typer/{self.session_id}/stop", timeout=5)
+                await self.client.post(f"{BASE_URL}/auto-typer/{self.session_id}/stop", timeout=5)
                 print(f"🧹 Cleaned up session: {self.session_id}")
             except:
                 pass
+        await self.client.aclose()
+    
+    async def _run_step(self, test_name, test_func):
+        """Run one test, logging a failure if it raises"""
+        try:
+            return bool(await test_func())
+        except Exception as e:
+            self.log_result(test_name, False, f"Test execution failed: {str(e)}")
+            return False
+    
+    async def _warmup(self):
+        """Open the API connection ahead of the first test; the result is ignored"""
+        try:
+            await self.client.get(f"{BASE_URL}/", timeout=5)
+        except Exception:
+            pass
+    
+    async def _run_all_async(self):
+        """Run the test phases in order; tests within a phase run concurrently"""
+        passed = 0
+        # The TCP/TLS/HTTP2 handshake happens here rather than inside Session Creation's timing
+        await self._warmup()
+        try:
+            for schedule in self.TEST_PHASES:
+                print(f"\n🔍 Running: {', '.join(test_name for test_name, _ in schedule)}")
+                phase = [(test_name, getattr(self, method_name)) for test_name, method_name in schedule]
+                results = await asyncio.gather(*(self._run_step(name, func) for name, func in phase))
+                passed += sum(results)
+        finally:
+            await self.cleanup_session()
+        return passed
     
     def run_all_tests(self):
         """Run all session management tests"""
@@ -294,42 +395,12 @@ class SessionManagementTester:
         print("Testing Discord Autotyper Session Control Issues")
         print("=" * 60)
         
-        # Test sequence focusing on user's reported issue
-        tests = [
-            ("Session Creation", self.test_session_creation),
-            ("Session Status Transitions", self.test_session_status_transitions),
-            ("Pause Control", self.test_pause_control),
-            ("Resume Control", self.test_resume_control),
-            ("Stop Control", self.test_stop_control),
-        ]
-        
-        # WebSocket tests
-        websocket_tests = [
-            ("WebSocket Connection", self.test_websocket_connection),
-        ]
-        
-        passed = 0
-        total = len(tests) + len(websocket_tests)
-        
-        # Run regular tests
-        for test_name, test_func in tests:
-            print(f"\n🔍 Running: {test_name}")
-            try:
-                if test_func():
-                    passed += 1
-                time.sleep(0.5)
-            except Exception as e:
-                self.log_result(test_name, False, f"Test execution failed: {str(e)}")
-        
-        # Run WebSocket tests
-        for test_name, test_func in websocket_tests:
-            print(f"\n🔍 Running: {test_name}")
-            try:
-                if self.run_websocket_test(test_func):
-                    passed += 1
-                time.sleep(0.5)
-            except Exception as e:
-                self.log_result(test_name, False, f"WebSocket test execution failed: {str(e)}")
+        # Test sequence focusing on user's reported issue, HTTP and WebSocket on one event loop
+        total = sum(len(phase) for phase in self.TEST_PHASES)
+        try:
+            passed = self._loop.run_until_complete(self._run_all_async())
+        finally:
+            self._loop.close()
         
         # Summary
         print("\n" + "=" * 60)
@@ -344,9 +415,6 @@ class SessionManagementTester:
             print(f"⚠️  {total - passed} tests failed.")
             print("❌ This may explain why control panel buttons are unresponsive")
         
-        # Cleanup
-        self.cleanup_session()
-        
         return passed, total, self.test_results
 
 if __name__ == "__main__":
@@ -354,11 +422,11 @@ if __name__ == "__main__":
     passed, total, results = tester.run_all_tests()
     
     # Save results
-    with open("/app/session_management_test_results.json", "w") as f:
-        json.dump({
+    with open("/app/session_management_test_results.json", "wb") as f:
+        f.write(orjson.dumps({
             "summary": {"passed": passed, "total": total, "success_rate": passed/total},
-            "results": results,
+            "results": [_with_timestamp(r) for r in results],
             "timestamp": datetime.now().isoformat()
-        }, f, indent=2)
+        }, option=orjson.OPT_INDENT_2))
     
     print(f"\n📝 Results saved to: /app/session_management_test_results.json")
\ No newline at end of file
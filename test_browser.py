@@ -4,28 +4,11 @@ Simple test to check if Playwright browser automation works
 """
 
 import asyncio
-from playwright.async_api import async_playwright
+from browser_tests import smoke
 
 async def test_browser():
     try:
-        async with async_playwright() as p:
-            print("Launching browser...")
-            browser = await p.chromium.launch(headless=True)
-            print("Browser launched successfully!")
-            
-            context = await browser.new_context()
-            page = await context.new_page()
-            
-            print("Navigating to a test page...")
-            await page.goto('https://httpbin.org/get')
-            
-            title = await page.title()
-            print(f"Page title: {title}")
-            
-            await browser.close()
-            print("Browser closed successfully!")
-            return True
-            
+        return await smoke(reporter=print)
     except Exception as e:
         print(f"Browser test failed: {str(e)}")
         return False
@@ -35,4 +18,4 @@ if __name__ == "__main__":
     if result:
         print("✅ Browser automation is working!")
     else:
-        print("❌ Browser automation failed!")
\ No newline at end of file
+        print("❌ Browser automation failed!")
@@ -4,18 +4,31 @@ WebSocket Real-time Testing for Discord Autotyper
 Tests WebSocket connection and real-time updates during session startup
 """
 
+import time
 import asyncio
 import websockets
-import json
-import requests
-from datetime import datetime
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+import httpx
+import orjson
 
 BASE_URL = "https://web-autotyper-1.preview.emergentagent.com/api"
 WS_URL = "wss://web-autotyper-1.preview.emergentagent.com/api/ws"
 HEADERS = {"Content-Type": "application/json"}
 
+def make_client():
+    """HTTP/2 client shared by the create and cleanup calls"""
+    return httpx.AsyncClient(http2=True, headers=HEADERS, timeout=15)
+
 async def test_websocket_with_session():
     """Test WebSocket connection with a real session"""
+    async with make_client() as client:
+        return await _check_session_websocket(client)
+
+async def _check_session_websocket(client):
+    """Create a session on client, then listen on its WebSocket"""
     
     # Create a session first
     payload = {
@@ -26,7 +39,7 @@ async def test_websocket_with_session():
     }
     
     print("🔍 Creating session for WebSocket test...")
-    response = requests.post(f"{BASE_URL}/auto-typer/start", json=payload, headers=HEADERS, timeout=15)
+    response = await client.post(f"{BASE_URL}/auto-typer/start", json=payload)
     
     if response.status_code != 200:
         print(f"❌ Failed to create session: {response.status_code}")
@@ -46,12 +59,12 @@ async def test_websocket_with_session():
             
             # Listen for messages for 10 seconds
             messages_received = []
-            start_time = datetime.now()
+            deadline = time.monotonic() + 10
             
             try:
-                while (datetime.now() - start_time).seconds < 10:
+                while time.monotonic() < deadline:
                     message = await asyncio.wait_for(websocket.recv(), timeout=2.0)
-                    data = json.loads(message)
+                    data = orjson.loads(message)
                     messages_received.append(data)
                     
                     msg_type = data.get("type", "unknown")
@@ -81,7 +94,7 @@ async def test_websocket_with_session():
             
             # Clean up session
             try:
-                requests.post(f"{BASE_URL}/auto-typer/{session_id}/stop", timeout=5)
+                await client.post(f"{BASE_URL}/auto-typer/{session_id}/stop", timeout=5)
                 print(f"🧹 Cleaned up session: {session_id}")
             except:
                 pass
@@ -96,7 +109,12 @@ if __name__ == "__main__":
     print("🚀 WebSocket Real-time Testing")
     print("=" * 50)
     
-    result = asyncio.run(test_websocket_with_session())
+    # uvloop-backed when available
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(test_websocket_with_session())
+    finally:
+        loop.close()
     
     if result:
         print("✅ WebSocket real-time communication is working!")